@@ -69,13 +69,35 @@ def convert_api_config_to_actions_format(api_config: Dict[str, Any]) -> Dict[str
         "validText": code_validation.get('validText', '')
     }
     
-    return {
+    # Optional network-response rule that decides validity before the DOM check.
+    # Fields: "urlPattern" (regex matched against the response URL), optional
+    # "jsonPath" (dot path into the JSON body), and at least one predicate:
+    # "validValue"/"invalidValue" (compared with the value at jsonPath, or the
+    # whole JSON body), "mismatchIsInvalid" (with validValue, any other value
+    # found means invalid) or "validText"/"invalidText" (searched in the value,
+    # or in the raw body without jsonPath). Example deciding both ways:
+    #   {"urlPattern": "graphql", "jsonPath": "data.discountApply.errors.length",
+    #    "validValue": 0, "mismatchIsInvalid": true}
+    # The rule is armed once the "fill" action has entered the coupon; responses
+    # that match no predicate are ignored and the promoCode element check above
+    # remains the fallback. See response-rule.js for the evaluation.
+    if code_validation.get('response'):
+        promo_code["response"] = code_validation['response']
+    
+    site_config = {
         "baseUrl": config.get('baseUrl', ''),
         "productUrl": config.get('productUrl', ''),
         "actions": actions,
         "waitTime": config.get('waitTime', 5000),
         "promoCode": promo_code
     }
+    
+    # Optional browserless engine for recognised platforms (e.g. "shopify").
+    # Opt-in only: the API config has to send "engine" for the site.
+    if config.get('engine'):
+        site_config["engine"] = config['engine']
+    
+    return site_config
 
 def generate_actions_json():
     """
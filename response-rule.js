@@ -0,0 +1,82 @@
+// Network-response validation rule (promoCode.response in actions.json).
+//
+//   urlPattern         regex matched against the response URL (required)
+//   jsonPath           optional dot path into the JSON body, e.g. "data.discountApply.errors.length";
+//                      without it the whole parsed body is used for value predicates
+//   validValue         value at jsonPath that means the coupon is valid
+//   invalidValue       value at jsonPath that means the coupon is not valid
+//   mismatchIsInvalid  with validValue: any other value found at jsonPath means not valid
+//   validText          text in the value at jsonPath (or the raw body) that means valid
+//   invalidText        text in the value at jsonPath (or the raw body) that means not valid
+//
+// At least one predicate is required. Responses that match no predicate are inconclusive,
+// so unrelated traffic on a shared endpoint (e.g. GraphQL) never decides the coupon.
+
+const VALUE_PREDICATES = ['validValue', 'invalidValue'];
+const TEXT_PREDICATES = ['validText', 'invalidText'];
+
+// Returns the compiled urlPattern, throws when the rule cannot be used.
+function compileResponseRule(rule) {
+    if (!rule.urlPattern) {
+        throw new Error('missing urlPattern');
+    }
+    if (![...VALUE_PREDICATES, ...TEXT_PREDICATES].some(key => key in rule)) {
+        throw new Error('missing validValue/invalidValue/validText/invalidText predicate');
+    }
+    if (rule.mismatchIsInvalid && !('validValue' in rule)) {
+        throw new Error('mismatchIsInvalid requires validValue');
+    }
+    try {
+        return new RegExp(rule.urlPattern);
+    } catch (e) {
+        throw new Error(`invalid urlPattern: ${e.message}`);
+    }
+}
+
+// Returns true/false when the response decides the coupon, null when it is inconclusive.
+function evaluateResponseRule(rule, body) {
+    let subject = body;
+    if (rule.jsonPath || VALUE_PREDICATES.some(key => key in rule)) {
+        let value;
+        try {
+            value = JSON.parse(body);
+        } catch (e) {
+            value = undefined;
+        }
+        for (const key of rule.jsonPath ? rule.jsonPath.split('.') : []) {
+            if (value === null || value === undefined) {
+                value = undefined;
+                break;
+            }
+            value = value[key];
+        }
+        if (value === undefined) {
+            // Text predicates still apply to the raw body when no path is configured.
+            if (rule.jsonPath) {
+                return null;
+            }
+        } else {
+            if ('validValue' in rule && JSON.stringify(value) === JSON.stringify(rule.validValue)) {
+                return true;
+            }
+            if ('invalidValue' in rule && JSON.stringify(value) === JSON.stringify(rule.invalidValue)) {
+                return false;
+            }
+            if (rule.mismatchIsInvalid) {
+                return false;
+            }
+            if (rule.jsonPath) {
+                subject = typeof value === 'string' ? value : JSON.stringify(value);
+            }
+        }
+    }
+    if (rule.validText && subject.includes(rule.validText)) {
+        return true;
+    }
+    if (rule.invalidText && subject.includes(rule.invalidText)) {
+        return false;
+    }
+    return null;
+}
+
+module.exports = {compileResponseRule, evaluateResponseRule};
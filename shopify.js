@@ -0,0 +1,91 @@
+const axios = require('axios');
+const http = require('http');
+const https = require('https');
+
+// Browserless coupon check for Shopify stores.
+// Returns true when the cart accepts the coupon, null when the browser flow should decide instead.
+//
+// Only a positive discount_codes[].applicable from /cart/update.js is trusted. Shopify evaluates
+// some discounts (e.g. shipping discounts) only at checkout, so applicable:false is inconclusive
+// and left to the browser flow, which reads the checkout itself.
+async function validateShopifyCoupon(siteConfig, coupon, {axiosConfig = {}, log = console.log, error = console.error} = {}) {
+    const session = createHttpSession(axiosConfig);
+    try {
+        const productUrl = new URL(siteConfig.productUrl);
+        const handle = productUrl.pathname.match(/\/products\/([^/]+)/)?.[1];
+        if (!handle) {
+            log(`[⚠️] No product handle in ${siteConfig.productUrl}`);
+            return null;
+        }
+
+        log(`[⚡] Shopify fast path on ${productUrl.origin}`);
+        let variantId = productUrl.searchParams.get('variant');
+        if (!/^\d+$/.test(variantId || '')) {
+            const product = (await session.get(`${productUrl.origin}/products/${handle}.js`)).data;
+            const variant = product.variants.find(v => v.available) || product.variants[0];
+            variantId = variant.id;
+        }
+
+        log(`[🛒] Adding variant ${variantId} to cart...`);
+        await session.post(`${productUrl.origin}/cart/add.js`, {items: [{id: Number(variantId), quantity: 1}]});
+
+        log('[💳] Applying coupon code to cart...');
+        const cart = (await session.post(`${productUrl.origin}/cart/update.js`, {discount: coupon})).data;
+        const discount = (cart.discount_codes || []).find(d => d.code.toLowerCase() === coupon.toLowerCase());
+        if (!discount) {
+            log('[⚠️] Cart response did not report the coupon code');
+            return null;
+        }
+        if (discount.applicable !== true) {
+            log('[⚠️] Cart did not apply the coupon, checkout may still accept it');
+            return null;
+        }
+        return true;
+    } catch (e) {
+        error(`[⚠️] Shopify fast path failed: ${e.message}`);
+        return null;
+    } finally {
+        session.close();
+    }
+}
+
+// Keep-alive axios instance that stores Set-Cookie values and sends them back on later requests.
+function createHttpSession(axiosConfig = {}) {
+    const httpAgent = new http.Agent({keepAlive: true});
+    const httpsAgent = new https.Agent({keepAlive: true});
+    const cookies = {};
+    const session = axios.create({
+        ...axiosConfig,
+        httpAgent,
+        httpsAgent,
+        timeout: 30000,
+        headers: {
+            'accept': 'application/json',
+            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36',
+        },
+    });
+    session.interceptors.request.use(config => {
+        const cookieHeader = Object.entries(cookies).map(([name, value]) => `${name}=${value}`).join('; ');
+        if (cookieHeader) {
+            config.headers['cookie'] = cookieHeader;
+        }
+        return config;
+    });
+    session.interceptors.response.use(response => {
+        for (const cookie of response.headers['set-cookie'] || []) {
+            const [pair] = cookie.split(';');
+            const index = pair.indexOf('=');
+            if (index > 0) {
+                cookies[pair.slice(0, index).trim()] = pair.slice(index + 1).trim();
+            }
+        }
+        return response;
+    });
+    session.close = () => {
+        httpAgent.destroy();
+        httpsAgent.destroy();
+    };
+    return session;
+}
+
+module.exports = {validateShopifyCoupon, createHttpSession};
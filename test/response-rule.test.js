@@ -0,0 +1,45 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const {compileResponseRule, evaluateResponseRule} = require('../response-rule');
+
+test('jsonPath match decides the coupon', () => {
+    const rule = {urlPattern: 'graphql', jsonPath: 'data.discountApply.errors.length', validValue: 0, invalidValue: 1};
+    assert.strictEqual(evaluateResponseRule(rule, '{"data":{"discountApply":{"errors":[]}}}'), true);
+    assert.strictEqual(evaluateResponseRule(rule, '{"data":{"discountApply":{"errors":["bad"]}}}'), false);
+});
+
+test('jsonPath miss is inconclusive', () => {
+    const rule = {urlPattern: 'graphql', jsonPath: 'data.discountApply.errors.length', validValue: 0};
+    assert.strictEqual(evaluateResponseRule(rule, '{"data":{"cart":{"lines":[]}}}'), null);
+    assert.strictEqual(evaluateResponseRule(rule, 'not json'), null);
+});
+
+test('mismatchIsInvalid turns any other value at jsonPath into invalid', () => {
+    const rule = {urlPattern: 'graphql', jsonPath: 'data.discountApply.errors.length', validValue: 0, mismatchIsInvalid: true};
+    assert.strictEqual(evaluateResponseRule(rule, '{"data":{"discountApply":{"errors":[1, 2]}}}'), false);
+    assert.strictEqual(evaluateResponseRule(rule, '{"data":{"cart":{}}}'), null);
+});
+
+test('value predicates without jsonPath compare the parsed body', () => {
+    assert.strictEqual(evaluateResponseRule({urlPattern: 'apply', validValue: true}, 'true'), true);
+    assert.strictEqual(evaluateResponseRule({urlPattern: 'apply', invalidValue: false}, 'false'), false);
+});
+
+test('text-only rules search the raw body', () => {
+    const rule = {urlPattern: 'discount', validText: 'DISCOUNT_APPLIED', invalidText: 'DISCOUNT_INVALID'};
+    assert.strictEqual(evaluateResponseRule(rule, '{"status":"DISCOUNT_APPLIED"}'), true);
+    assert.strictEqual(evaluateResponseRule(rule, '{"status":"DISCOUNT_INVALID"}'), false);
+});
+
+test('unrelated response on a shared endpoint stays inconclusive', () => {
+    assert.strictEqual(evaluateResponseRule({urlPattern: 'graphql', validText: 'DISCOUNT_APPLIED'}, '{"data":{"cart":{}}}'), null);
+    assert.strictEqual(evaluateResponseRule({urlPattern: 'graphql', jsonPath: 'a.b', validValue: 0}, '{"a":{"c":1}}'), null);
+});
+
+test('unusable rules are rejected', () => {
+    assert.ok(compileResponseRule({urlPattern: 'graphql', validText: 'ok'}) instanceof RegExp);
+    assert.throws(() => compileResponseRule({validText: 'ok'}), /urlPattern/);
+    assert.throws(() => compileResponseRule({urlPattern: 'graphql', jsonPath: 'a.b'}), /predicate/);
+    assert.throws(() => compileResponseRule({urlPattern: '(', validText: 'ok'}), /invalid urlPattern/);
+    assert.throws(() => compileResponseRule({urlPattern: 'graphql', invalidText: 'x', mismatchIsInvalid: true}), /validValue/);
+});
@@ -0,0 +1,92 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const http = require('http');
+const {validateShopifyCoupon} = require('../shopify');
+
+// Local stand-in for the Shopify product and cart endpoints used by the fast path.
+function startStandIn() {
+    const carts = {};
+    const requests = [];
+    let nextCartId = 1;
+
+    const server = http.createServer((req, res) => {
+        let body = '';
+        req.on('data', chunk => body += chunk);
+        req.on('end', () => {
+            requests.push({url: req.url, cookie: req.headers.cookie || ''});
+            const send = (status, data, headers = {}) => {
+                res.writeHead(status, {'content-type': 'application/json', ...headers});
+                res.end(JSON.stringify(data));
+            };
+            const cartId = (req.headers.cookie || '').match(/(?:^|;\s*)cart=(\w+)/)?.[1];
+
+            if (req.method === 'GET' && req.url === '/products/widget.js') {
+                return send(200, {variants: [{id: 1, available: false}, {id: 2, available: true}]});
+            }
+            if (req.method === 'POST' && req.url === '/cart/add.js') {
+                const {items} = JSON.parse(body);
+                if (items[0].id === 422) {
+                    return send(422, {status: 422, description: 'Sold out'});
+                }
+                const id = `c${nextCartId++}`;
+                carts[id] = {items, discount_codes: []};
+                return send(200, {items}, {'set-cookie': `cart=${id}; path=/; HttpOnly`});
+            }
+            if (req.method === 'POST' && req.url === '/cart/update.js') {
+                if (!carts[cartId]) {
+                    return send(422, {status: 422, description: 'Cart not found'});
+                }
+                const code = JSON.parse(body).discount;
+                const known = {SAVE10: true, EXPIRED: false};
+                const cart = carts[cartId];
+                cart.discount_codes = code.toUpperCase() in known
+                    ? [{code, applicable: known[code.toUpperCase()]}]
+                    : [];
+                return send(200, cart);
+            }
+            send(404, {status: 404, description: 'Not Found'});
+        });
+    });
+
+    return new Promise(resolve => {
+        server.listen(0, '127.0.0.1', () => {
+            resolve({server, requests, origin: `http://127.0.0.1:${server.address().port}`});
+        });
+    });
+}
+
+const quiet = {log: () => {}, error: () => {}};
+
+test('shopify fast path against a local stand-in', async t => {
+    const {server, requests, origin} = await startStandIn();
+    t.after(() => server.close());
+
+    await t.test('applicable discount is valid', async () => {
+        assert.strictEqual(await validateShopifyCoupon({productUrl: `${origin}/products/widget`}, 'save10', quiet), true);
+    });
+
+    await t.test('not applicable discount is left to the browser flow', async () => {
+        assert.strictEqual(await validateShopifyCoupon({productUrl: `${origin}/products/widget?variant=5`}, 'EXPIRED', quiet), null);
+    });
+
+    await t.test('coupon missing from discount_codes is inconclusive', async () => {
+        assert.strictEqual(await validateShopifyCoupon({productUrl: `${origin}/products/widget`}, 'UNKNOWN', quiet), null);
+    });
+
+    await t.test('404 is inconclusive', async () => {
+        assert.strictEqual(await validateShopifyCoupon({productUrl: `${origin}/products/missing`}, 'SAVE10', quiet), null);
+    });
+
+    await t.test('422 is inconclusive', async () => {
+        assert.strictEqual(await validateShopifyCoupon({productUrl: `${origin}/products/widget?variant=422`}, 'SAVE10', quiet), null);
+    });
+
+    await t.test('cart cookie is sent back on the next request', async () => {
+        requests.length = 0;
+        await validateShopifyCoupon({productUrl: `${origin}/products/widget?variant=7`}, 'SAVE10', quiet);
+        const add = requests.find(r => r.url === '/cart/add.js');
+        const update = requests.find(r => r.url === '/cart/update.js');
+        assert.strictEqual(add.cookie, '');
+        assert.match(update.cookie, /(?:^|;\s*)cart=c\d+/);
+    });
+});
@@ -2,6 +2,8 @@ const { firefox } = require('playwright');
 const fs = require('fs');
 const axios = require('axios');
 const actions = require('./actions.json');
+const {validateShopifyCoupon} = require('./shopify');
+const {compileResponseRule, evaluateResponseRule} = require('./response-rule');
 require('dotenv').config();
 let logs = [];
 let page;
@@ -62,121 +64,145 @@ let page;
             }catch (e) {
                 log('[❌❌❌] There is a problem with the script.');
             }
-            const outputDir = './output';
-            if (!fs.existsSync(outputDir)) {
-                fs.mkdirSync(outputDir, {recursive: true});
-            }
-            fs.writeFileSync('./output/result.json', JSON.stringify({logs, couponIsValid: couponIsValid}, null, 2));
+            writeResult(couponIsValid);
         }else {
-            log('[⏳] Starting headless-browser...');
-            const userDataDir = './pw-user';
-
-            const browserCtx = await firefox.launchPersistentContext(userDataDir, {
-                headless: true,
-                ...(proxy && {proxy}),
-                locale: 'en-US',
-                userAgent: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36',
-            });
+            const shopifyResult = siteConfig.engine === 'shopify'
+                ? await validateShopifyCoupon(siteConfig, coupon, {axiosConfig: getAxiosProxyConfig(proxy), log, error})
+                : null;
 
-            page = browserCtx.pages()[0];
+            if (shopifyResult !== null) {
+                log(shopifyResult ? '[🎉🎉🎉] Coupon is valid!' : '[❌❌❌] Coupon is not valid.');
+                const outputDir = writeResult(shopifyResult);
+                // Drop artifacts of an earlier browser run so they cannot contradict this result
+                for (const file of ['screenshot.png', 'html_snapshot.html']) {
+                    fs.rmSync(`${outputDir}/${file}`, {force: true});
+                }
+            } else {
+                if (siteConfig.engine === 'shopify') {
+                    log('[↩️] Shopify fast path inconclusive, falling back to headless-browser');
+                }
+                log('[⏳] Starting headless-browser...');
+                const userDataDir = './pw-user';
 
-            await page.addInitScript(() => {
-                Object.defineProperty(navigator, 'webdriver', {get: () => false});
-                window.navigator.chrome = {runtime: {}};
-                Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-            });
+                const browserCtx = await firefox.launchPersistentContext(userDataDir, {
+                    headless: true,
+                    ...(proxy && {proxy}),
+                    locale: 'en-US',
+                    userAgent: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36',
+                });
 
-            let couponIsValid = false;
+                page = browserCtx.pages()[0];
 
-            try {
-                log(`[🌐] Go to Website ${siteConfig.productUrl}`);
-                await page.goto(siteConfig.productUrl, {waitUntil: 'domcontentloaded', timeout: 60000});
-                await page.waitForLoadState('networkidle', {timeout: 3000}).catch(() => {
+                await page.addInitScript(() => {
+                    Object.defineProperty(navigator, 'webdriver', {get: () => false});
+                    window.navigator.chrome = {runtime: {}};
+                    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+                    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
                 });
-                await page.waitForTimeout(siteConfig.waitTime);
-
-                if (siteConfig.actions.length) {
-                    for (let action of siteConfig.actions) {
-                        log(`[👉] Action: ${action.name}`);
-                        log(action.event);
-                        if (action.selectors.length > 0) {
-                            for (let selector of action.selectors) {
-                                try {
-                                    let issetSelector = await retryWaitForSelector(page, selector, {
-                                        timeout: action.waitAfter,
-                                        state: 'attached'
-                                    }, 5, 1000, action.required);
-                                    if (issetSelector) {
-                                        if (action.type === 'fill') {
-                                            await page.fill(selector, coupon, {timeout: action.waitAfter});
-                                            await page.dispatchEvent(selector, 'input');
-                                            await page.dispatchEvent(selector, 'change');
-                                        } else if (action.type === 'click') {
-                                            const el = await page.$(selector);
-                                            if (el) {
-                                                await el.evaluate(el => el.click());
+
+                let couponIsValid = false;
+
+                // Check for validation using promoCode structure (for new format) or codeValidation (for old format)
+                const validationConfig = siteConfig.promoCode || siteConfig.codeValidation;
+                const responseWatcher = validationConfig?.response
+                    ? watchValidationResponse(page, validationConfig.response, !siteConfig.actions.some(a => a.type === 'fill'))
+                    : null;
+
+                try {
+                    log(`[🌐] Go to Website ${siteConfig.productUrl}`);
+                    await page.goto(siteConfig.productUrl, {waitUntil: 'domcontentloaded', timeout: 60000});
+                    await page.waitForLoadState('networkidle', {timeout: 3000}).catch(() => {
+                    });
+                    await page.waitForTimeout(siteConfig.waitTime);
+
+                    if (siteConfig.actions.length) {
+                        for (let action of siteConfig.actions) {
+                            if (responseWatcher && responseWatcher.verdict !== null) {
+                                break;
+                            }
+                            log(`[👉] Action: ${action.name}`);
+                            log(action.event);
+                            if (action.selectors.length > 0) {
+                                for (let selector of action.selectors) {
+                                    if (responseWatcher && responseWatcher.verdict !== null) {
+                                        break;
+                                    }
+                                    try {
+                                        let issetSelector = await retryWaitForSelector(page, selector, {
+                                            timeout: action.waitAfter,
+                                            state: 'attached'
+                                        }, 5, 1000, action.required);
+                                        if (issetSelector) {
+                                            if (action.type === 'fill') {
+                                                await page.fill(selector, coupon, {timeout: action.waitAfter});
+                                                await page.dispatchEvent(selector, 'input');
+                                                await page.dispatchEvent(selector, 'change');
+                                                if (responseWatcher) {
+                                                    responseWatcher.armed = true;
+                                                }
+                                            } else if (action.type === 'click') {
+                                                const el = await page.$(selector);
+                                                if (el) {
+                                                    await el.evaluate(el => el.click());
+                                                }
+                                            } else {
+                                                await page[action.type](selector, {timeout: action.waitAfter, force: true});
+                                            }
+                                            if (action.waitAfter) {
+                                                log(`⏳ Waiting ${action.waitAfter}ms after action`);
+                                                await waitUnlessDecided(action.waitAfter, responseWatcher);
                                             }
-                                        } else {
-                                            await page[action.type](selector, {timeout: action.waitAfter, force: true});
-                                        }
-                                        if (action.waitAfter) {
-                                            log(`⏳ Waiting ${action.waitAfter}ms after action`);
-                                            await new Promise(resolve => setTimeout(resolve, action.waitAfter));
                                         }
+                                    } catch (e) {
+                                        break;
+                                        error(`[⚠️] Failed action "${action.name}" on selector "${selector}": ${e.message}`);
                                     }
-                                } catch (e) {
-                                    break;
-                                    error(`[⚠️] Failed action "${action.name}" on selector "${selector}": ${e.message}`);
                                 }
                             }
                         }
                     }
-                }
 
-                await page.waitForTimeout(siteConfig.waitTime);
+                    await waitUnlessDecided(siteConfig.waitTime, responseWatcher);
 
-                // Check for validation using promoCode structure (for new format) or codeValidation (for old format)
-                const validationConfig = siteConfig.promoCode || siteConfig.codeValidation;
-                if (!validationConfig) {
-                    log('[❌❌❌] No validation configuration found');
-                    couponIsValid = false;
-                } else {
-                    const elementSelector = validationConfig.elementAlert || validationConfig.element;
-                    const validText = validationConfig.validText;
-                    
-                    if (!elementSelector || !validText) {
-                        log('[❌❌❌] Missing validation configuration');
+                    if (responseWatcher && responseWatcher.verdict !== null) {
+                        couponIsValid = responseWatcher.verdict;
+                        log(couponIsValid ? '[🎉🎉🎉] Coupon is valid!' : '[❌❌❌] Coupon is not valid.');
+                    } else if (!validationConfig) {
+                        log('[❌❌❌] No validation configuration found');
                         couponIsValid = false;
                     } else {
-                        const element = await page.$(elementSelector);
-                        if (element) {
-                            const text = await element.innerText();
-                            if (text.includes(validText)) {
-                                log('[🎉🎉🎉] Coupon is valid!');
-                                couponIsValid = true;
+                        const elementSelector = validationConfig.elementAlert || validationConfig.element;
+                        const validText = validationConfig.validText;
+                    
+                        if (!elementSelector || !validText) {
+                            log('[❌❌❌] Missing validation configuration');
+                            couponIsValid = false;
+                        } else {
+                            const element = await page.$(elementSelector);
+                            if (element) {
+                                const text = await element.innerText();
+                                if (text.includes(validText)) {
+                                    log('[🎉🎉🎉] Coupon is valid!');
+                                    couponIsValid = true;
+                                } else {
+                                    log('[❌❌❌] Coupon is not valid.');
+                                }
                             } else {
                                 log('[❌❌❌] Coupon is not valid.');
                             }
-                        } else {
-                            log('[❌❌❌] Coupon is not valid.');
                         }
                     }
-                }
 
-            } catch (e) {
-                error(`❌ Unexpected error: ${e.message}`);
-            }
-            await clearSiteStorage(page);
-            const outputDir = './output';
-            if (!fs.existsSync(outputDir)) {
-                fs.mkdirSync(outputDir, {recursive: true});
+                } catch (e) {
+                    error(`❌ Unexpected error: ${e.message}`);
+                }
+                await clearSiteStorage(page);
+                const outputDir = writeResult(couponIsValid);
+                const html = await page.content();
+                await page.screenshot({path: `${outputDir}/screenshot.png`, fullPage: true});
+                fs.writeFileSync(`${outputDir}/html_snapshot.html`, html);
+                await browserCtx.close();
             }
-            const html = await page.content();
-            await page.screenshot({path: `${outputDir}/screenshot.png`, fullPage: true});
-            fs.writeFileSync(`${outputDir}/html_snapshot.html`, html);
-            fs.writeFileSync(`${outputDir}/result.json`, JSON.stringify({logs, couponIsValid}, null, 2));
-            await browserCtx.close();
         }
         
         // Ensure clean exit
@@ -235,6 +261,15 @@ async function clearSiteStorage(page) {
     log('✅ [CLEANUP] Cleanup completed');
 
 }
+function writeResult(couponIsValid) {
+    const outputDir = './output';
+    if (!fs.existsSync(outputDir)) {
+        fs.mkdirSync(outputDir, {recursive: true});
+    }
+    fs.writeFileSync(`${outputDir}/result.json`, JSON.stringify({logs, couponIsValid}, null, 2));
+    return outputDir;
+}
+
 function log(message) {
     // Ensure message is properly encoded for console output
     const safeMessage = typeof message === 'string' ? message.replace(/[^\x00-\x7F]/g, '?') : String(message);
@@ -264,10 +299,57 @@ async function retryWaitForSelector(page, selector, options = {}, maxAttempts =
     }
 }
 
-async function getApiData(url, params = {}, proxy = undefined){
-    let axiosConfig = {};
-    if (proxy) {
-        axiosConfig.proxy = {
+// Settles the coupon from the first response matching promoCode.response once armed
+// (after the "fill" action). Rule fields (urlPattern, jsonPath, validValue/invalidValue,
+// mismatchIsInvalid, validText/invalidText) are described in response-rule.js.
+// Returns null for an unusable rule so the promoCode element check decides.
+function watchValidationResponse(page, rule, armed = false) {
+    let urlPattern;
+    try {
+        urlPattern = compileResponseRule(rule);
+    } catch (e) {
+        error(`[⚠️] Ignoring promoCode.response rule: ${e.message}`);
+        return null;
+    }
+    const watcher = {verdict: null, armed};
+    watcher.decided = new Promise(resolve => {
+        page.on('response', async response => {
+            if (!watcher.armed || watcher.verdict !== null || !urlPattern.test(response.url())) {
+                return;
+            }
+            let body;
+            try {
+                body = await response.text();
+            } catch (e) {
+                return;
+            }
+            const verdict = evaluateResponseRule(rule, body);
+            if (verdict === null || watcher.verdict !== null) {
+                return;
+            }
+            log(`[📡] Validation response received from ${response.url()}`);
+            watcher.verdict = verdict;
+            resolve(verdict);
+        });
+    });
+    return watcher;
+}
+
+async function waitUnlessDecided(ms, watcher) {
+    let timer;
+    const timeout = new Promise(resolve => {
+        timer = setTimeout(resolve, ms);
+    });
+    await (watcher ? Promise.race([timeout, watcher.decided]) : timeout);
+    clearTimeout(timer);
+}
+
+function getAxiosProxyConfig(proxy = undefined) {
+    if (!proxy) {
+        return {};
+    }
+    return {
+        proxy: {
             protocol: process.env.PROXY_PROTOCOL ? process.env.PROXY_PROTOCOL : 'http', // http або https
             host: process.env.PROXY_SERVER ?  process.env.PROXY_SERVER.split(':')[0] : null,
             port: process.env.PROXY_SERVER ?  process.env.PROXY_SERVER.split(':')[1] : null,
@@ -275,8 +357,12 @@ async function getApiData(url, params = {}, proxy = undefined){
                 proxy.username && proxy.password
                     ? { username: proxy.username, password: proxy.password }
                     : undefined
-        };
-    }
+        }
+    };
+}
+
+async function getApiData(url, params = {}, proxy = undefined){
+    let axiosConfig = getAxiosProxyConfig(proxy);
     try {
         const res = await axios.post(url, params,{
             ...axiosConfig,